@@ -19,10 +19,13 @@
 import gi
 import os
 import json
+import collections
+import queue
 import threading
 import requests
 import time
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 gi.require_version("Gtk", "4.0")
 from gi.repository import Gtk, GLib
@@ -35,10 +38,44 @@ from sugar4.activity.widgets import StopButton, ActivityToolbarButton
 from sugar4.graphics.alert import Alert
 from sugar4.graphics.icon import Icon
 
+# Prefer orjson for (de)serializing activity data when it is available
+try:
+    import orjson
+
+    def _dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+    _loads = json.loads
+
+# Questions offered as examples below the input area
+_EXAMPLE_QUESTIONS = (
+    "How do I create a Sugar activity with GTK4?",
+    "What is the difference between lists and tuples in Python?",
+    "How do I add a button to my Sugar activity?",
+    "How do I use Pygame in a Sugar activity?",
+)
+
+# Number of question/answer turns kept in the chat view
+_MAX_VISIBLE_TURNS = 50
+
+# Maximum number of answers remembered for repeated questions
+_CACHE_MAX = 128
+
 
 class SugarAIActivity(Activity):
     """Sugar-AI Activity class for integrating with Sugar-AI API."""
 
+    _STATUS_OK_MARKUP = "<span color='green'>✓ API Key configured</span>"
+    _STATUS_WARN_MARKUP = (
+        "<span color='red'>⚠ No API Key - Click 'API Key' to configure</span>"
+    )
+
     def __init__(self, handle, application=None):
         """Set up the Sugar-AI activity."""
         Activity.__init__(self, handle, application=application)
@@ -48,9 +85,46 @@ class SugarAIActivity(Activity):
         self._api_base_url = "https://ai.sugarlabs.org"
         self._conversation_history = []
         self._is_requesting = False
+        self._scroll_pending = False
+        self._status_state = None
+        self._error_alert = None
+        self._error_alert_shown = False
+
+        # Buffer marks at the start of each visible user turn, oldest first
+        self._turn_marks = collections.deque()
+
+        # Answers keyed by (endpoint, normalized question), in LRU order
+        self._answer_cache = collections.OrderedDict()
+        self._answer_cache_loaded = False
+
+        # Keep one pooled HTTPS connection alive across questions and retries
+        self._http_session = requests.Session()
+        self._http_session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0),
+        )
+
+        # Paths of the files kept in the activity data directory
+        data_dir = os.path.join(self.get_activity_root(), "data")
+        self._config_path = os.path.join(data_dir, "config.json")
+        self._cache_path = os.path.join(data_dir, "cache.json")
+
+        # File I/O runs on a worker thread to keep the UI responsive
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+
+        # Set once the journal or the user provides a key; config.json
+        # only supplies the key when neither has
+        self._api_key_overridden = False
+
+        # API requests run on their own daemon worker so they never queue
+        # behind I/O and never keep the process alive after closing
+        self._net_stop = threading.Event()
+        self._net_queue = queue.Queue()
+        threading.Thread(target=self._net_worker, daemon=True).start()
 
-        # Load saved API key if exists
+        # Load saved API key and answer cache if they exist
         self._load_api_key()
+        self._io_pool.submit(self._load_answer_cache)
 
         # We do not have collaboration features yet!
         # Make the share option insensitive
@@ -62,6 +136,10 @@ class SugarAIActivity(Activity):
 
         self.set_title("Sugar-AI Assistant")
 
+        # Release workers only once the window is really gone, since
+        # Activity.close() may return without closing
+        self.connect("destroy", self._on_destroy)
+
     def _setup_toolbar(self):
         """Set up the activity toolbar."""
         toolbar_box = ToolbarBox()
@@ -95,6 +173,15 @@ class SugarAIActivity(Activity):
         self._rag_button.set_active(True)  # Default to RAG mode
         toolbar_box.toolbar.append(self._rag_button)
 
+        # Show earlier messages toggle
+        self._show_earlier_button = Gtk.ToggleButton()
+        self._show_earlier_button.set_label(_("Show Earlier"))
+        self._show_earlier_button.set_tooltip_text(
+            _("Show the whole conversation instead of the latest messages")
+        )
+        self._show_earlier_button.connect("toggled", self._on_show_earlier_toggled)
+        toolbar_box.toolbar.append(self._show_earlier_button)
+
         # Spacer to push stop button to the right
         spacer = Gtk.Box()
         spacer.set_hexpand(True)
@@ -115,19 +202,19 @@ class SugarAIActivity(Activity):
         main_box.set_margin_end(12)
 
         # Title and status
-        title_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        title_box = Gtk.Grid(row_spacing=6, column_homogeneous=True)
 
         title_label = Gtk.Label()
         title_label.set_markup(
             "<span size='x-large' weight='bold'>Sugar-AI Assistant</span>"
         )
         title_label.set_halign(Gtk.Align.CENTER)
-        title_box.append(title_label)
+        title_box.attach(title_label, 0, 0, 1, 1)
 
         self._status_label = Gtk.Label()
         self._update_status_label()
         self._status_label.set_halign(Gtk.Align.CENTER)
-        title_box.append(self._status_label)
+        title_box.attach(self._status_label, 0, 1, 1, 1)
 
         main_box.append(title_box)
 
@@ -149,6 +236,11 @@ class SugarAIActivity(Activity):
         # Set up text tags for formatting
         self._setup_text_tags()
 
+        # Right-gravity mark that stays at the end of the chat for scrolling
+        self._end_mark = self._chat_buffer.create_mark(
+            "end", self._chat_buffer.get_end_iter(), False
+        )
+
         scrolled.set_child(self._chat_view)
         chat_frame.set_child(scrolled)
         main_box.append(chat_frame)
@@ -183,24 +275,17 @@ class SugarAIActivity(Activity):
         examples_frame = Gtk.Frame()
         examples_frame.set_label(_("Example Questions"))
 
-        examples_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=3)
+        examples_box = Gtk.Grid(row_spacing=3, column_homogeneous=True)
         examples_box.set_margin_top(6)
         examples_box.set_margin_bottom(6)
         examples_box.set_margin_start(6)
         examples_box.set_margin_end(6)
 
-        example_questions = [
-            "How do I create a Sugar activity with GTK4?",
-            "What is the difference between lists and tuples in Python?",
-            "How do I add a button to my Sugar activity?",
-            "How do I use Pygame in a Sugar activity?",
-        ]
-
-        for question in example_questions:
+        for i, question in enumerate(_EXAMPLE_QUESTIONS):
             button = Gtk.Button()
             button.set_label(question)
-            button.connect("clicked", lambda btn, q=question: self._set_question(q))
-            examples_box.append(button)
+            button.connect("clicked", self._on_example_clicked)
+            examples_box.attach(button, 0, i, 1, 1)
 
         examples_frame.set_child(examples_box)
         main_box.append(examples_frame)
@@ -209,60 +294,72 @@ class SugarAIActivity(Activity):
 
     def _setup_text_tags(self):
         """Set up text formatting tags for the chat buffer."""
-        # User question tag
-        user_tag = self._chat_buffer.create_tag("user")
-        user_tag.set_property("weight", 700)  # Bold
-        user_tag.set_property("foreground", "#0066cc")
+        # User question tag (bold)
+        self._chat_buffer.create_tag("user", weight=700, foreground="#0066cc")
 
         # AI response tag
-        ai_tag = self._chat_buffer.create_tag("ai")
-        ai_tag.set_property("foreground", "#006600")
+        self._chat_buffer.create_tag("ai", foreground="#006600")
 
         # Error tag
-        error_tag = self._chat_buffer.create_tag("error")
-        error_tag.set_property("foreground", "#cc0000")
+        self._chat_buffer.create_tag("error", foreground="#cc0000")
 
-        # System tag
-        system_tag = self._chat_buffer.create_tag("system")
-        system_tag.set_property("style", 2)  # Italic
-        system_tag.set_property("foreground", "#666666")
+        # System tag (italic)
+        self._chat_buffer.create_tag("system", style=2, foreground="#666666")
 
     def _load_api_key(self):
-        """Load API key from activity data."""
+        """Load API key from activity data in the background."""
+        self._io_pool.submit(self._read_config)
+
+    def _read_config(self):
+        """Read the saved configuration (runs on the I/O worker)."""
         try:
-            data_dir = os.path.join(self.get_activity_root(), "data")
-            if os.path.exists(data_dir):
-                config_file = os.path.join(data_dir, "config.json")
-                if os.path.exists(config_file):
-                    with open(config_file, "r") as f:
-                        config = json.load(f)
-                        self._api_key = config.get("api_key", "")
+            with open(self._config_path, "rb") as f:
+                config = _loads(f.read())
+            if not isinstance(config, dict) or not isinstance(
+                config.get("api_key", ""), str
+            ):
+                config = {}
+            GLib.idle_add(self._apply_api_key, config)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
         except Exception as e:
             print(f"Error loading API key: {e}")
 
+    def _apply_api_key(self, config):
+        """Apply a loaded configuration unless a key was provided since."""
+        if self._api_key_overridden:
+            return
+
+        self._api_key = config.get("api_key", "")
+        self._http_session.headers.update({"X-API-Key": self._api_key})
+        self._update_status_label()
+
     def _save_api_key(self):
-        """Save API key to activity data."""
-        try:
-            data_dir = os.path.join(self.get_activity_root(), "data")
-            os.makedirs(data_dir, exist_ok=True)
-            config_file = os.path.join(data_dir, "config.json")
+        """Save API key to activity data in the background."""
+        self._api_key_overridden = True
+        self._http_session.headers.update({"X-API-Key": self._api_key})
+        self._io_pool.submit(self._write_config, {"api_key": self._api_key})
 
-            config = {"api_key": self._api_key}
-            with open(config_file, "w") as f:
-                json.dump(config, f)
+    def _write_config(self, config):
+        """Write the configuration (runs on the I/O worker)."""
+        try:
+            os.makedirs(os.path.dirname(self._config_path), exist_ok=True)
+            with open(self._config_path, "wb") as f:
+                f.write(_dumps(config))
         except Exception as e:
             print(f"Error saving API key: {e}")
 
     def _update_status_label(self):
         """Update the status label based on API key state."""
-        if self._api_key:
-            self._status_label.set_markup(
-                "<span color='green'>✓ API Key configured</span>"
-            )
+        new_state = bool(self._api_key)
+        if new_state == self._status_state:
+            return
+
+        self._status_state = new_state
+        if new_state:
+            self._status_label.set_markup(self._STATUS_OK_MARKUP)
         else:
-            self._status_label.set_markup(
-                "<span color='red'>⚠ No API Key - Click 'API Key' to configure</span>"
-            )
+            self._status_label.set_markup(self._STATUS_WARN_MARKUP)
 
     def _on_api_key_clicked(self, button):
         """Handle API key configuration button click."""
@@ -272,11 +369,19 @@ class SugarAIActivity(Activity):
     def _on_clear_clicked(self, button):
         """Handle clear conversation button click."""
         self._conversation_history = []
+        self._clear_turn_marks()
         self._chat_buffer.set_text("")
         self._add_system_message("Conversation cleared.")
 
+    def _on_show_earlier_toggled(self, button):
+        """Handle show earlier messages toggle."""
+        self._render_history()
+
     def _on_ask_clicked(self, widget):
         """Handle ask button click or entry activation."""
+        if self._is_requesting:
+            return
+
         question = self._question_entry.get_text().strip()
         if not question:
             return
@@ -285,15 +390,19 @@ class SugarAIActivity(Activity):
             self._show_error_alert("Please configure your API key first.")
             return
 
-        if self._is_requesting:
-            return
-
         # Clear input
         self._question_entry.set_text("")
 
         # Add question to chat
         self._add_user_message(question)
 
+        # Answer repeated questions straight from the cache
+        key = self._cache_key(self._get_endpoint(), question)
+        if key in self._answer_cache:
+            self._answer_cache.move_to_end(key)
+            self._add_ai_message(self._answer_cache[key])
+            return
+
         # Show "thinking" message
         self._add_system_message(
             "Sugar-AI is thinking... This may take 2-5 minutes, please be patient."
@@ -303,9 +412,78 @@ class SugarAIActivity(Activity):
         self._set_input_sensitive(False)
 
         # Start API request in background thread
-        threading.Thread(
-            target=self._make_api_request, args=(question,), daemon=True
-        ).start()
+        self._net_queue.put(question)
+
+    def _get_endpoint(self):
+        """Return the API endpoint matching the RAG toggle."""
+        return "/ask" if self._rag_button.get_active() else "/ask-llm"
+
+    def _cache_key(self, endpoint, question):
+        """Build the answer cache key for a question."""
+        return (endpoint, " ".join(question.lower().split()))
+
+    def _cache_answer(self, key, answer):
+        """Remember an answer, evicting the least recently used one."""
+        self._answer_cache[key] = answer
+        self._answer_cache.move_to_end(key)
+        if len(self._answer_cache) > _CACHE_MAX:
+            self._answer_cache.popitem(last=False)
+
+    def _load_answer_cache(self):
+        """Load the persistent answer cache (runs on the I/O worker)."""
+        entries = []
+        try:
+            with open(self._cache_path, "rb") as f:
+                data = _loads(f.read())
+            if isinstance(data, list):
+                entries = [
+                    row
+                    for row in data
+                    if isinstance(row, list)
+                    and len(row) == 3
+                    and all(isinstance(value, str) for value in row)
+                ]
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        except Exception as e:
+            print(f"Error loading answer cache: {e}")
+        GLib.idle_add(self._apply_answer_cache, entries)
+
+    def _apply_answer_cache(self, entries):
+        """Merge saved answers under the ones cached this session."""
+        cache = collections.OrderedDict()
+        for endpoint, question, answer in entries[-_CACHE_MAX:]:
+            cache[(endpoint, question)] = answer
+        for key, answer in self._answer_cache.items():
+            cache.pop(key, None)
+            cache[key] = answer
+        while len(cache) > _CACHE_MAX:
+            cache.popitem(last=False)
+
+        self._answer_cache = cache
+        self._answer_cache_loaded = True
+
+    def _save_answer_cache(self):
+        """Save the answer cache to activity data."""
+        # Never overwrite the saved cache before it has been merged in
+        if not self._answer_cache_loaded:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+
+            entries = [
+                [endpoint, question, answer]
+                for (endpoint, question), answer in self._answer_cache.items()
+            ]
+            with open(self._cache_path, "wb") as f:
+                f.write(_dumps(entries))
+        except Exception as e:
+            print(f"Error saving answer cache: {e}")
+
+    def _on_example_clicked(self, button):
+        """Handle example question button click."""
+        self._set_question(button.get_label())
 
     def _set_question(self, question):
         """Set a question in the input field."""
@@ -313,7 +491,9 @@ class SugarAIActivity(Activity):
 
     def _add_user_message(self, message):
         """Add a user message to the chat."""
+        self._conversation_history.append({"type": "user", "message": message})
         end_iter = self._chat_buffer.get_end_iter()
+        self._turn_marks.append(self._chat_buffer.create_mark(None, end_iter, True))
         self._chat_buffer.insert_with_tags_by_name(
             end_iter, f"You: {message}\n\n", "user"
         )
@@ -321,10 +501,12 @@ class SugarAIActivity(Activity):
 
     def _add_ai_message(self, message):
         """Add an AI response to the chat."""
+        self._conversation_history.append({"type": "ai", "message": message})
         end_iter = self._chat_buffer.get_end_iter()
         self._chat_buffer.insert_with_tags_by_name(
             end_iter, f"Sugar-AI: {message}\n\n", "ai"
         )
+        self._trim_chat()
         self._scroll_to_bottom()
 
     def _add_error_message(self, message):
@@ -343,15 +525,84 @@ class SugarAIActivity(Activity):
         )
         self._scroll_to_bottom()
 
+    def _trim_chat(self):
+        """Drop the oldest turns from the chat view beyond the visible limit."""
+        if self._show_earlier_button.get_active():
+            return
+
+        while len(self._turn_marks) > _MAX_VISIBLE_TURNS:
+            oldest = self._turn_marks.popleft()
+            self._chat_buffer.delete(
+                self._chat_buffer.get_start_iter(),
+                self._chat_buffer.get_iter_at_mark(self._turn_marks[0]),
+            )
+            self._chat_buffer.delete_mark(oldest)
+
+    def _clear_turn_marks(self):
+        """Forget the marks of all visible turns."""
+        while self._turn_marks:
+            self._chat_buffer.delete_mark(self._turn_marks.popleft())
+
+    def _render_history(self):
+        """Render the conversation history with a single buffer insert.
+
+        Only questions and answers are kept; status and error notices are
+        not part of the history and are dropped.
+        """
+        entries = self._conversation_history
+        if not self._show_earlier_button.get_active():
+            user_indices = [
+                i for i, entry in enumerate(entries) if entry["type"] == "user"
+            ]
+            if len(user_indices) > _MAX_VISIBLE_TURNS:
+                entries = entries[user_indices[-_MAX_VISIBLE_TURNS] :]
+
+        chunks = []
+        ranges = []
+        offset = 0
+        for entry in entries:
+            if entry["type"] == "user":
+                chunk = f"You: {entry['message']}\n\n"
+            elif entry["type"] == "ai":
+                chunk = f"Sugar-AI: {entry['message']}\n\n"
+            else:
+                continue
+            chunks.append(chunk)
+            ranges.append((offset, offset + len(chunk), entry["type"]))
+            offset += len(chunk)
+
+        self._clear_turn_marks()
+        self._chat_buffer.begin_irreversible_action()
+        self._chat_buffer.set_text("".join(chunks))
+        for start, end, tag_name in ranges:
+            start_iter = self._chat_buffer.get_iter_at_offset(start)
+            self._chat_buffer.apply_tag_by_name(
+                tag_name, start_iter, self._chat_buffer.get_iter_at_offset(end)
+            )
+            if tag_name == "user":
+                self._turn_marks.append(
+                    self._chat_buffer.create_mark(None, start_iter, True)
+                )
+        self._chat_buffer.end_irreversible_action()
+        self._scroll_to_bottom()
+
     def _scroll_to_bottom(self):
-        """Scroll chat view to bottom."""
-        mark = self._chat_buffer.get_insert()
-        self._chat_view.scroll_mark_onscreen(mark)
+        """Scroll chat view to bottom once the main loop is idle."""
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            GLib.idle_add(self._do_scroll)
+
+    def _do_scroll(self):
+        """Perform a pending scroll to the bottom of the chat view."""
+        self._scroll_pending = False
+        self._chat_view.scroll_mark_onscreen(self._end_mark)
+        return GLib.SOURCE_REMOVE
 
     def _set_input_sensitive(self, sensitive):
         """Enable/disable input controls."""
         self._question_entry.set_sensitive(sensitive)
         self._ask_button.set_sensitive(sensitive)
+        self._show_earlier_button.set_sensitive(sensitive)
         self._is_requesting = not sensitive
 
         # Update button text to show status
@@ -360,61 +611,109 @@ class SugarAIActivity(Activity):
         else:
             self._ask_button.set_label(_("Thinking..."))
 
+    def _net_worker(self):
+        """Run queued API requests one at a time (daemon thread)."""
+        while True:
+            question = self._net_queue.get()
+            if question is None:
+                return
+            self._make_api_request(question)
+
+    def _idle_add(self, callback, *args):
+        """Schedule a UI update from the worker unless the activity is closing."""
+        if not self._net_stop.is_set():
+            GLib.idle_add(callback, *args)
+
+    def _poll_until_ready(self, deadline):
+        """Wait until the Sugar-AI health check succeeds or the deadline passes."""
+        # Always give an overloaded server a moment before checking, since
+        # /health can answer while the app server is still busy
+        delay = 2
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._net_stop.wait(min(delay, remaining)):
+                return False
+            delay = min(delay * 2, 8)
+
+            try:
+                response = self._http_session.get(
+                    f"{self._api_base_url}/health", timeout=5
+                )
+                if response.status_code == 200:
+                    return True
+            except requests.exceptions.RequestException:
+                pass
+
     def _make_api_request(self, question):
         """Make API request in background thread with retry logic."""
         max_retries = 3
-        retry_delays = [60, 120, 180]  # Wait 1, 2, then 3 minutes between retries
+        retry_delays = [60, 120, 180]  # Wait at most 1, 2, then 3 minutes
+        succeeded = False
 
         try:
             for attempt in range(max_retries):
+                if self._net_stop.is_set():
+                    return  # The activity was closed while waiting
+
                 try:
                     if attempt > 0:
-                        GLib.idle_add(
+                        self._idle_add(
                             self._add_system_message,
-                            f"Attempt {attempt + 1}/{max_retries} - retrying in {retry_delays[attempt - 1]} seconds...",
+                            f"Attempt {attempt + 1}/{max_retries} - waiting up to {retry_delays[attempt - 1]} seconds for Sugar-AI to recover...",
                         )
-                        time.sleep(retry_delays[attempt - 1])
-                        GLib.idle_add(
-                            self._add_system_message, "Retrying request to Sugar-AI..."
+                        ready = self._poll_until_ready(
+                            time.monotonic() + retry_delays[attempt - 1]
                         )
+                        if self._net_stop.is_set():
+                            return  # The activity was closed while waiting
+                        if ready:
+                            message = "Sugar-AI is responding again. Retrying request..."
+                        else:
+                            # No healthy reply (or no /health); retry anyway
+                            message = "Retrying request to Sugar-AI..."
+                        self._idle_add(self._add_system_message, message)
 
                     # Choose endpoint based on RAG toggle
-                    endpoint = "/ask" if self._rag_button.get_active() else "/ask-llm"
+                    endpoint = self._get_endpoint()
                     url = f"{self._api_base_url}{endpoint}"
 
-                    params = {"question": quote(question)}
-                    headers = {"X-API-Key": self._api_key}
+                    params = {"question": question}
 
                     # Make the request (Sugar-AI can take 2-5 minutes to respond)
-                    response = requests.post(
-                        url, params=params, headers=headers, timeout=300
-                    )
+                    response = self._http_session.post(url, params=params, timeout=300)
 
                     if response.status_code == 200:
                         result = response.json()
                         answer = result.get("answer", "No answer received.")
 
                         # Update quota info if available
+                        quota_text = None
                         quota = result.get("quota", {})
                         if quota:
                             remaining = quota.get("remaining", "Unknown")
                             total = quota.get("total", "Unknown")
-                            GLib.idle_add(
-                                self._add_system_message, f"Quota: {remaining}/{total}"
-                            )
+                            quota_text = f"Quota: {remaining}/{total}"
+
+                        # Only cache real answers, never the placeholder
+                        key = None
+                        if "answer" in result:
+                            key = self._cache_key(endpoint, question)
 
-                        # Add the response
-                        GLib.idle_add(self._add_ai_message, answer)
+                        # Add the response and re-enable input in one hop
+                        self._idle_add(self._finish_success, key, quota_text, answer)
+                        succeeded = True
                         return  # Success, exit the retry loop
 
                     elif response.status_code == 401:
-                        GLib.idle_add(
+                        self._idle_add(
                             self._add_error_message,
                             "Invalid API key. Please check your configuration.",
                         )
                         return  # Don't retry auth errors
                     elif response.status_code == 429:
-                        GLib.idle_add(
+                        self._idle_add(
                             self._add_error_message,
                             "Rate limit exceeded. Please try again later.",
                         )
@@ -422,24 +721,24 @@ class SugarAIActivity(Activity):
                     elif response.status_code == 504:
                         # Server timeout - this is worth retrying
                         if attempt == max_retries - 1:  # Last attempt
-                            GLib.idle_add(
+                            self._idle_add(
                                 self._add_error_message,
                                 f"Server timeout (504) after {max_retries} attempts. The Sugar-AI service is experiencing high load. Please try again later.",
                             )
                         else:
-                            GLib.idle_add(
+                            self._idle_add(
                                 self._add_system_message,
                                 f"Server timeout (504) on attempt {attempt + 1}. Will retry...",
                             )
                         continue  # Retry for server timeouts
                     elif response.status_code == 503:
-                        GLib.idle_add(
+                        self._idle_add(
                             self._add_error_message,
                             "Service unavailable (503). The Sugar-AI service may be down for maintenance. Please try again later.",
                         )
                         return  # Don't retry service unavailable
                     else:
-                        GLib.idle_add(
+                        self._idle_add(
                             self._add_error_message,
                             f"API error {response.status_code}: {response.text}",
                         )
@@ -447,64 +746,84 @@ class SugarAIActivity(Activity):
 
                 except requests.exceptions.Timeout:
                     if attempt == max_retries - 1:  # Last attempt
-                        GLib.idle_add(
+                        self._idle_add(
                             self._add_error_message,
                             f"Request timed out after 5 minutes on {max_retries} attempts. The Sugar-AI service may be experiencing high load. Please try again later.",
                         )
                     else:
-                        GLib.idle_add(
+                        self._idle_add(
                             self._add_system_message,
                             f"Request timed out on attempt {attempt + 1}. Will retry...",
                         )
                     continue  # Retry for timeouts
                 except requests.exceptions.ConnectionError:
-                    GLib.idle_add(
+                    self._idle_add(
                         self._add_error_message,
                         "Connection error. Please check your internet connection.",
                     )
                     return  # Don't retry connection errors
                 except Exception as e:
-                    GLib.idle_add(
+                    self._idle_add(
                         self._add_error_message, f"Unexpected error: {str(e)}"
                     )
                     return  # Don't retry unexpected errors
 
         finally:
-            # Always re-enable input, regardless of success or failure
-            GLib.idle_add(self._set_input_sensitive, True)
+            # Always re-enable input; on success _finish_success does it
+            if not succeeded:
+                self._idle_add(self._set_input_sensitive, True)
+
+    def _finish_success(self, key, quota_text, answer):
+        """Show a successful response and re-enable input."""
+        if key is not None:
+            self._cache_answer(key, answer)
+        self._chat_buffer.begin_user_action()
+        if quota_text:
+            self._add_system_message(quota_text)
+        self._add_ai_message(answer)
+        self._chat_buffer.end_user_action()
+        self._set_input_sensitive(True)
 
     def _show_error_alert(self, message):
-        """Show an error alert dialog."""
-        alert = Alert()
-        alert.props.title = _("Error")
-        alert.props.msg = message
+        """Show an error alert dialog, reusing the existing alert."""
+        if self._error_alert is None:
+            self._error_alert = Alert()
+            self._error_alert.props.title = _("Error")
 
-        ok_icon = Icon(icon_name="dialog-ok")
-        alert.add_button(Gtk.ResponseType.OK, _("OK"), ok_icon)
-        alert.connect("response", self._alert_response_cb)
+            ok_icon = Icon(icon_name="dialog-ok")
+            self._error_alert.add_button(Gtk.ResponseType.OK, _("OK"), ok_icon)
+            self._error_alert.connect("response", self._alert_response_cb)
 
-        self.add_alert(alert)
+        self._error_alert.props.msg = message
+        if not self._error_alert_shown:
+            self._error_alert_shown = True
+            self.add_alert(self._error_alert)
 
     def _alert_response_cb(self, alert, response_id):
         """Handle alert response."""
+        self._error_alert_shown = False
         self.remove_alert(alert)
 
+    def _on_destroy(self, widget):
+        """Release worker threads and network resources."""
+        self._net_stop.set()
+        self._net_queue.put(None)
+        self._io_pool.shutdown(wait=True)
+        self._http_session.close()
+
     def read_file(self, file_path):
         """Read activity data from file."""
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            with open(file_path, "rb") as f:
+                data = _loads(f.read())
 
             self._api_key = data.get("api_key", "")
+            self._api_key_overridden = True
+            self._http_session.headers.update({"X-API-Key": self._api_key})
             self._conversation_history = data.get("conversation_history", [])
 
             # Restore conversation
-            self._chat_buffer.set_text("")
-            for entry in self._conversation_history:
-                if entry["type"] == "user":
-                    self._add_user_message(entry["message"])
-                elif entry["type"] == "ai":
-                    self._add_ai_message(entry["message"])
+            self._render_history()
 
             self._update_status_label()
 
@@ -513,49 +832,30 @@ class SugarAIActivity(Activity):
 
     def write_file(self, file_path):
         """Write activity data to file."""
+        data = {
+            "api_key": self._api_key,
+            "conversation_history": self._conversation_history,
+        }
+        # Sugar reads the file as soon as we return, so wait for the worker
         try:
-            # Extract conversation from buffer
-            start_iter = self._chat_buffer.get_start_iter()
-            end_iter = self._chat_buffer.get_end_iter()
-            text = self._chat_buffer.get_text(start_iter, end_iter, False)
-
-            # Parse conversation (simplified)
-            conversation = []
-            lines = text.split("\n")
-            current_message = ""
-            current_type = None
-
-            for line in lines:
-                if line.startswith("You: "):
-                    if current_message and current_type:
-                        conversation.append(
-                            {"type": current_type, "message": current_message.strip()}
-                        )
-                    current_message = line[5:]
-                    current_type = "user"
-                elif line.startswith("Sugar-AI: "):
-                    if current_message and current_type:
-                        conversation.append(
-                            {"type": current_type, "message": current_message.strip()}
-                        )
-                    current_message = line[10:]
-                    current_type = "ai"
-                elif current_message:
-                    current_message += "\n" + line
-
-            if current_message and current_type:
-                conversation.append(
-                    {"type": current_type, "message": current_message.strip()}
-                )
-
-            data = {"api_key": self._api_key, "conversation_history": conversation}
+            future = self._io_pool.submit(self._write_data, file_path, data)
+        except RuntimeError:
+            # The I/O worker has already been shut down; write directly
+            self._write_data(file_path, data)
+        else:
+            future.result()
 
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
+    def _write_data(self, file_path, data):
+        """Write activity data and the answer cache (runs on the I/O worker)."""
+        try:
+            with open(file_path, "wb") as f:
+                f.write(_dumps(data, indent=True))
 
         except Exception as e:
             print(f"Error writing file: {e}")
 
+        self._save_answer_cache()
+
 
 class APIKeyDialog(Gtk.Window):
     """Dialog for configuring API key."""